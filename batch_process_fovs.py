@@ -26,8 +26,9 @@ from ophys_analysis import (
     extract_suite2p_traces,
     save_extraction_hdf5,
     create_full_analysis_report,
-    get_tuning_madineh,
+    get_tuning_population,
 )
+from ophys_analysis.tuning_analysis import MIN_TUNING_DIRS
 
 
 def find_data_directories(base_dir: Path, pattern: str = "202*") -> List[Path]:
@@ -138,26 +139,30 @@ def process_single_fov(data_dir: Path,
         n_cells = len(ce.cells)
         n_responsive = sum(c.ROI_responsiveness for c in ce.cells)
 
-        # Calculate tuning metrics for responsive cells
+        # Calculate tuning metrics for responsive cells (fit in parallel)
         tuning_metrics = []
-        for i, cell in enumerate(ce.cells):
-            if cell.ROI_responsiveness:
-                n_dirs = len(cell.uniqStims) - 1
-                if n_dirs > 0:
-                    stimInfo = np.arange(0, 360, 360/n_dirs)
-                    try:
-                        tuning, _, _ = get_tuning_madineh(cell.condition_response[:n_dirs], stimInfo)
-                        tuning_metrics.append({
-                            'cell_id': i,
-                            'pref_ort': tuning['pref_ort_fit'],
-                            'pref_dir': tuning['pref_dir_fit'],
-                            'oti': tuning['oti_fit'],
-                            'dti': tuning['dti_fit'],
-                            'bandwidth': tuning['fit_bandwidth'],
-                            'fit_r': tuning['fit_r'],
-                        })
-                    except Exception as e:
-                        print(f"    Warning: Could not analyze cell {i}: {e}")
+        responsive = [(i, cell) for i, cell in enumerate(ce.cells) if cell.ROI_responsiveness]
+        # All cells in a FOV share the same stimulus set
+        n_dirs = len(responsive[0][1].uniqStims) - 1 if responsive else 0
+        if n_dirs >= MIN_TUNING_DIRS:
+            stimInfo = np.arange(0, 360, 360/n_dirs)
+            results = get_tuning_population(
+                [cell.condition_response[:n_dirs] for _, cell in responsive], stimInfo
+            )
+            for (i, _), result in zip(responsive, results):
+                if isinstance(result, Exception):
+                    print(f"    Warning: Could not analyze cell {i}: {result}")
+                    continue
+                tuning = result[0]
+                tuning_metrics.append({
+                    'cell_id': i,
+                    'pref_ort': tuning['pref_ort_fit'],
+                    'pref_dir': tuning['pref_dir_fit'],
+                    'oti': tuning['oti_fit'],
+                    'dti': tuning['dti_fit'],
+                    'bandwidth': tuning['fit_bandwidth'],
+                    'fit_r': tuning['fit_r'],
+                })
 
         # Save tuning metrics to subdirectory
         import pandas as pd
@@ -7,8 +7,19 @@ extraction, trial organization, and orientation tuning analysis.
 
 from .cell_data import Cell, CellExtraction
 from .trace_extraction import extract_suite2p_traces
-from .tuning_analysis import get_tuning_madineh, double_gauss, fit_tuning_direction
-from .io_utils import save_extraction_hdf5, load_extraction_hdf5
+from .tuning_analysis import (
+    get_tuning_madineh,
+    get_tuning_population,
+    double_gauss,
+    fit_tuning_direction,
+)
+from .io_utils import (
+    save_extraction_hdf5,
+    load_extraction_hdf5,
+    repack_hdf5,
+    save_extraction_zarr,
+    load_extraction_zarr,
+)
 from .plotting import (
     plot_cell_tuning_curve,
     plot_orientation_map,
@@ -24,10 +35,14 @@ __all__ = [
     'CellExtraction',
     'extract_suite2p_traces',
     'get_tuning_madineh',
+    'get_tuning_population',
     'double_gauss',
     'fit_tuning_direction',
     'save_extraction_hdf5',
     'load_extraction_hdf5',
+    'repack_hdf5',
+    'save_extraction_zarr',
+    'load_extraction_zarr',
     'plot_cell_tuning_curve',
     'plot_orientation_map',
     'plot_tuning_distributions',
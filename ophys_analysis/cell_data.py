@@ -5,10 +5,17 @@ This module defines classes to hold cell/ROI data from 2-photon imaging experime
 """
 
 import numpy as np
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple, Tuple
 from pathlib import Path
 
 
+class CellSchema(NamedTuple):
+    """Cell attribute names grouped by how they are stored"""
+    array_attrs: Tuple[str, ...]
+    scalar_attrs: Tuple[str, ...]
+    str_attrs: Tuple[str, ...]
+
+
 class Cell:
     """
     Individual cell/ROI data from 2-photon imaging.
@@ -57,6 +64,45 @@ class Cell:
         uniqStims: Unique stimulus IDs
     """
 
+    # Storage schema used by io_utils: each attribute is written as one
+    # dataset spanning all cells (shape [n_cells, ...])
+    CELL_ARRAY_ATTRS = (
+        'raw', 'dff', 'neu', 'spks',
+        'cyc', 'Fotrace',
+        'mask', 'mask_2d',
+        'scans', 'scanTimes',
+        'regoffsets_trialx', 'regoffsets_trialy',
+        'trial_response', 'trial_pre_stim_response', 'trial_pre_stim_response_std',
+        'condition_response', 'condition_pre_stim_response',
+        'condition_response_std', 'condition_pre_stim_response_std',
+        'condition_baseline_plus_2SD', 'condition_response_significance',
+        'stimOn2pFrame', 'uniqStims',
+    )
+    CELL_SCALAR_ATTRS = ('xPos', 'yPos', 'scanPeriod', 'rate', 'ROI_responsiveness')
+    # Storage dtypes of the scalar attributes (fields of /cells/scalars in HDF5)
+    CELL_SCALAR_DTYPES = {
+        'xPos': np.float64,
+        'yPos': np.float64,
+        'scanPeriod': np.float64,
+        'rate': np.float64,
+        'ROI_responsiveness': np.bool_,
+    }
+    CELL_STR_ATTRS = ('file',)
+
+    # Memoized CellSchema, see Cell.schema()
+    __schema__: Optional[CellSchema] = None
+
+    @classmethod
+    def schema(cls) -> CellSchema:
+        """Storage schema of this Cell class (computed once per class)"""
+        if cls.__dict__.get('__schema__') is None:
+            cls.__schema__ = CellSchema(
+                array_attrs=tuple(cls.CELL_ARRAY_ATTRS),
+                scalar_attrs=tuple(cls.CELL_SCALAR_ATTRS),
+                str_attrs=tuple(cls.CELL_STR_ATTRS),
+            )
+        return cls.__schema__
+
     def __init__(self):
         # Raw traces
         self.raw: Optional[np.ndarray] = None
@@ -101,6 +147,37 @@ class Cell:
         self.stimOn2pFrame: Optional[np.ndarray] = None
         self.uniqStims: Optional[np.ndarray] = None
 
+        # Lazily loaded attributes: name -> (dataset, index), see defer_attr()
+        self._lazy: Dict[str, Tuple[Any, int]] = {}
+
+    def defer_attr(self, attr: str, dataset, index: int):
+        """
+        Defer loading of an attribute until it is first accessed.
+
+        Args:
+            attr: Attribute name (e.g., 'raw')
+            dataset: Array-like stacked across cells (e.g., h5py Dataset)
+            index: Row of this cell in the dataset
+        """
+        self.__dict__.pop(attr, None)
+        self._lazy[attr] = (dataset, index)
+
+    def __getattr__(self, name: str):
+        # Only called when normal lookup fails: materialize deferred attributes
+        lazy = self.__dict__.get('_lazy')
+        if lazy and name in lazy:
+            dataset, index = lazy[name]
+            try:
+                value = dataset[index]
+            except (OSError, ValueError) as e:
+                raise RuntimeError(
+                    f"Could not load deferred attribute '{name}' (was its file closed?)"
+                ) from e
+            del lazy[name]
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
 
 class CellExtraction:
     """
@@ -120,6 +197,8 @@ class CellExtraction:
         regOffsets: Global registration offsets [n_frames, 2]
         fov: Reference to FOV configuration object
         fov_index: Index of this FOV in the FOV list
+        h5_datasets: Open h5py Datasets of trace arrays across cells
+            (only when loaded with load_extraction_hdf5(..., lazy=True))
     """
 
     def __init__(self, fov=None, fov_index: int = 0):
@@ -138,10 +217,27 @@ class CellExtraction:
         self.fov = fov
         self.fov_index = fov_index
 
+        # Open HDF5 file and datasets when loaded with lazy=True
+        self._h5file = None
+        self.h5_datasets: Dict[str, Any] = {}
+
     def __len__(self) -> int:
         """Return number of cells"""
         return len(self.cells)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the HDF5 file kept open by load_extraction_hdf5(..., lazy=True)"""
+        if self._h5file is not None:
+            self._h5file.close()
+            self._h5file = None
+            self.h5_datasets = {}
+
     def __getitem__(self, index: int) -> Cell:
         """Access cells by index"""
         return self.cells[index]
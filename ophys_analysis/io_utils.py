@@ -5,22 +5,377 @@ HDF5 I/O utilities for saving and loading cell extraction data.
 import h5py
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
 
-from .cell_data import Cell, CellExtraction
+from .cell_data import Cell, CellExtraction, CellSchema
 
+# FOV export (assumes fov_config_suite2p is importable, as for the scripts)
+try:
+    from fov_config_suite2p import export_fov_to_dict
+except ImportError:
+    export_fov_to_dict = None
+
+try:
+    import hdf5plugin
+    HAS_HDF5PLUGIN = True
+except ImportError:
+    HAS_HDF5PLUGIN = False
+
+try:
+    import bitshuffle
+    import bitshuffle.h5  # Registers the HDF5 filter
+    HAS_BITSHUFFLE = True
+except ImportError:
+    HAS_BITSHUFFLE = False
+
+# HDF5 filter ID registered for bitshuffle
+BSHUF_FILTER_ID = 32008
+
+
+# Large per-cell arrays that are written chunked and compressed
+COMPRESSED_ATTRS = (
+    'raw', 'dff', 'neu', 'spks',
+    'cyc', 'regoffsets_trialx', 'regoffsets_trialy',
+    'mask_2d',
+)
+
+# Session-level arrays stored under /acquisition
+ACQUISITION_KEYS = ('twophotontimes', 'stimOn', 'stimID', 'uniqStims', 'regOffsets')
+
+# Target chunk size in bytes (HDF5 works best with ~256 KiB - 1 MiB chunks)
+CHUNK_TARGET_BYTES = 1024 * 1024
+
+# Per-dataset chunk cache: large enough to hold many whole-cell chunks so
+# sequential cell access never decompresses the same chunk twice.
+# Slot count should be a prime much larger than the number of cached chunks.
+H5_CACHE_KWARGS = {
+    'rdcc_nbytes': 64 * 1024 * 1024,
+    'rdcc_nslots': 1_000_003,
+}
+
+
+# ============================================================================
+# Cell array helpers
+# ============================================================================
+
+def _chunk_rows(data: np.ndarray) -> int:
+    """Number of whole cells per chunk (up to 64, ~CHUNK_TARGET_BYTES)"""
+    row_bytes = max(data[0].nbytes, 1)
+    return int(max(1, min(64, data.shape[0], CHUNK_TARGET_BYTES // row_bytes)))
+
+
+def _compression_kwargs(data: np.ndarray) -> dict:
+    """
+    Chunking/compression options for a stacked [n_cells, ...] array.
+
+    Chunks hold whole cells (up to 64 per chunk, ~1 MiB). Uses bitshuffle+LZ4
+    when hdf5plugin is installed, otherwise h5py's built-in shuffle+LZF.
+    Both decompress far faster than gzip.
+    """
+    # No checksums on bulk trace data (pure CPU overhead on every chunk)
+    kwargs = {'chunks': (_chunk_rows(data),) + data.shape[1:], 'fletcher32': False}
+
+    if HAS_HDF5PLUGIN:
+        kwargs.update(hdf5plugin.Bitshuffle(cname='lz4'))
+    else:
+        kwargs.update(compression='lzf', shuffle=True)
+    return kwargs
+
+
+def _bshuf_block_size(itemsize: int) -> int:
+    """Bitshuffle block size in elements (~8 KiB, multiple of 8, as bitshuffle's default)"""
+    return max(128, (8192 // itemsize) // 8 * 8)
+
+
+def _bshuf_compress_chunk(chunk: np.ndarray, block_size: int) -> bytes:
+    """
+    Compress one chunk into the byte layout of the HDF5 bitshuffle filter.
+
+    The filter prefixes the LZ4 blocks with a 12-byte header: uncompressed
+    size (uint64, big-endian) and block size in bytes (uint32, big-endian).
+    """
+    chunk = np.ascontiguousarray(chunk)
+    header = (np.array([chunk.nbytes], dtype='>u8').tobytes() +
+              np.array([block_size * chunk.itemsize], dtype='>u4').tobytes())
+    return header + bitshuffle.compress_lz4(chunk, block_size).tobytes()
+
+
+def _write_direct_chunks(cells_grp: h5py.Group, attr: str, data: np.ndarray):
+    """
+    Write a stacked array with bitshuffle+LZ4, compressing chunks in parallel.
+
+    Chunks are compressed in a thread pool and written with write_direct_chunk,
+    bypassing the single-threaded HDF5 filter pipeline.
+    """
+    rows = _chunk_rows(data)
+    block_size = _bshuf_block_size(data.itemsize)
+    dset = cells_grp.create_dataset(
+        attr, shape=data.shape, dtype=data.dtype,
+        chunks=(rows,) + data.shape[1:],
+        compression=BSHUF_FILTER_ID,
+        compression_opts=(block_size, bitshuffle.h5.H5_COMPRESS_LZ4),
+        fletcher32=False,  # Direct chunks must not carry a checksum
+    )
+
+    def compress(start):
+        chunk = data[start:start + rows]
+        if chunk.shape[0] < rows:
+            # Edge chunks are stored at full chunk size
+            padded = np.zeros((rows,) + data.shape[1:], dtype=data.dtype)
+            padded[:chunk.shape[0]] = chunk
+            chunk = padded
+        return start, _bshuf_compress_chunk(chunk, block_size)
+
+    offset_tail = (0,) * (data.ndim - 1)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for start, payload in pool.map(compress, range(0, data.shape[0], rows)):
+            dset.id.write_direct_chunk((start,) + offset_tail, payload)
+
+
+def _fov_attrs(fov) -> dict:
+    """FOV parameters as a dict of attribute-safe values"""
+    if export_fov_to_dict is None:
+        raise ImportError("Saving FOV metadata requires fov_config_suite2p.py on the Python path")
+    return _clean_attrs(export_fov_to_dict(fov))
+
+
+def _clean_attrs(attrs: dict) -> dict:
+    """Drop None values and convert types HDF5 attrs can't store to strings"""
+    return {key: (val if isinstance(val, (int, float, bool, str, np.generic, np.ndarray))
+                  else str(val))
+            for key, val in attrs.items() if val is not None}
+
+
+def _write_cell_arrays(cells_grp: h5py.Group, attr: str, values: List):
+    """
+    Write one array attribute for all cells as a single dataset.
+
+    Arrays with matching shapes are stacked into [n_cells, ...]. Ragged arrays
+    (e.g. ROI masks) or partially missing values are flattened and
+    concatenated, with per-cell shapes stored in '<attr>_shapes' (-1 = None).
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return
+
+    shape = np.shape(present[0])
+    if len(present) == len(values) and all(np.shape(v) == shape for v in present):
+        data = np.stack(values)
+        if attr in COMPRESSED_ATTRS and data.size:
+            if HAS_BITSHUFFLE and data.dtype.isnative and data.dtype.kind in 'iufb':
+                _write_direct_chunks(cells_grp, attr, data)
+            else:
+                cells_grp.create_dataset(attr, data=data, **_compression_kwargs(data))
+        else:
+            cells_grp.create_dataset(attr, data=data)
+        return
+
+    flat, shapes = _ragged_cell_arrays(values)
+    if attr in COMPRESSED_ATTRS and flat.size:
+        kwargs = _compression_kwargs(flat)
+        # Flat data has no per-cell rows, so size chunks by bytes alone
+        kwargs['chunks'] = (int(min(flat.size, max(1, CHUNK_TARGET_BYTES // flat.itemsize))),)
+        dset = cells_grp.create_dataset(attr, data=flat, **kwargs)
+    else:
+        dset = cells_grp.create_dataset(attr, data=flat)
+    dset.attrs['ragged'] = True
+    cells_grp.create_dataset(f'{attr}_shapes', data=shapes)
+
+
+def _ragged_cell_arrays(values: List) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten and concatenate per-cell arrays; returns (flat, shapes) with -1 = None"""
+    present = [v for v in values if v is not None]
+    ndim = max(np.ndim(v) for v in present)
+    shapes = np.full((len(values), ndim), -1, dtype=np.int64)
+    for i, v in enumerate(values):
+        if v is not None:
+            shapes[i, :np.ndim(v)] = np.shape(v)
+    flat = np.concatenate([np.ravel(v) for v in present])
+    return flat, shapes
+
+
+def _split_ragged(flat: np.ndarray, shapes: np.ndarray) -> List[Optional[np.ndarray]]:
+    """Inverse of _ragged_cell_arrays: split a flat array back into per-cell arrays"""
+    sizes = np.prod(np.where(shapes < 0, 1, shapes), axis=1)
+    sizes[shapes[:, 0] < 0] = 0
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+    values = []
+    for i, shape in enumerate(shapes):
+        if shape[0] < 0:
+            values.append(None)
+        else:
+            shape = tuple(int(d) for d in shape if d >= 0)
+            values.append(flat[offsets[i]:offsets[i + 1]].reshape(shape))
+    return values
+
+
+def _cell_schema(cells: List[Cell]) -> CellSchema:
+    """
+    Storage schema for a list of cells.
+
+    Starts from the memoized Cell.schema() and adds any extra public
+    attributes set on the cells (e.g. brain_region). Each extra attribute is
+    classified once, from its first non-None value across the cells.
+    """
+    schema = Cell.schema()
+    known = set(schema.array_attrs + schema.scalar_attrs + schema.str_attrs)
+
+    extra_arrays, extra_scalars, extra_strs = [], [], []
+    for cell in cells:
+        for attr, val in vars(cell).items():
+            if val is None or attr in known or attr.startswith('_'):
+                continue
+            known.add(attr)  # Classified (or unsupported); skip for later cells
+            if isinstance(val, np.ndarray):
+                extra_arrays.append(attr)
+            elif isinstance(val, (bool, int, float, np.bool_, np.number)):
+                extra_scalars.append(attr)
+            elif isinstance(val, str):
+                extra_strs.append(attr)
+
+    return CellSchema(
+        array_attrs=schema.array_attrs + tuple(extra_arrays),
+        scalar_attrs=schema.scalar_attrs + tuple(extra_scalars),
+        str_attrs=schema.str_attrs + tuple(extra_strs),
+    )
+
+
+def _stored_schema(cells_grp) -> CellSchema:
+    """Schema recorded in a /cells group, falling back to the Cell schema"""
+    if 'array_attrs' not in cells_grp.attrs:
+        return Cell.schema()
+    return CellSchema(
+        array_attrs=tuple(str(a) for a in cells_grp.attrs['array_attrs']),
+        scalar_attrs=tuple(str(a) for a in cells_grp.attrs['scalar_attrs']),
+        str_attrs=tuple(str(a) for a in cells_grp.attrs['str_attrs']),
+    )
+
+
+def _write_schema(cells_grp, schema: CellSchema):
+    """Record the schema in a /cells group so extra attributes can be loaded"""
+    cells_grp.attrs['array_attrs'] = list(schema.array_attrs)
+    cells_grp.attrs['scalar_attrs'] = list(schema.scalar_attrs)
+    cells_grp.attrs['str_attrs'] = list(schema.str_attrs)
+
+
+def _write_shared_strings(root, cells_grp, schema: CellSchema,
+                          cells: List[Cell]) -> Tuple[str, ...]:
+    """
+    Store string attributes that are identical across all cells once, as
+    /fov_metadata attrs, and list them in /cells attrs['_shared_strs'].
+
+    Returns the string attributes that still need per-cell storage.
+    """
+    shared, per_cell = [], []
+    for attr in schema.str_attrs:
+        values = {getattr(c, attr, None) for c in cells}
+        val = values.pop() if len(values) == 1 else None
+        if val is None:
+            per_cell.append(attr)
+            continue
+
+        fov_grp = root.require_group('fov_metadata')
+        if attr in fov_grp.attrs and fov_grp.attrs[attr] != val:
+            per_cell.append(attr)  # Don't overwrite a different FOV value
+            continue
+
+        fov_grp.attrs[attr] = val
+        shared.append(attr)
+
+    if shared:
+        cells_grp.attrs['_shared_strs'] = shared
+    return tuple(per_cell)
+
+
+def _read_shared_strings(root, cells_grp, cells: List[Cell]):
+    """Broadcast string attributes stored by _write_shared_strings back to each cell"""
+    for attr in cells_grp.attrs.get('_shared_strs', []):
+        attr = str(attr)
+        val = str(root['fov_metadata'].attrs[attr])
+        for cell in cells:
+            setattr(cell, attr, val)
+
+
+def _scalar_column(attr: str, values: List) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Build a 1-D array of a scalar attribute across cells.
+
+    Returns (data, valid); data is None if no cell has a value. If some cells
+    are None, valid is a bool mask of the cells that have a value (their
+    entries in data are zero), otherwise valid is None. Data keeps the
+    attribute's dtype, so bools stay bools and NaN stays a value.
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return None, None
+
+    dtype = Cell.CELL_SCALAR_DTYPES.get(attr)
+    if dtype is None:
+        # Extra attribute: promote across all cells (e.g. 3 and 2.5 -> float)
+        dtype = np.asarray(present).dtype
+    if len(present) == len(values):
+        return np.fromiter(values, dtype=dtype, count=len(values)), None
+
+    valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+    data = np.zeros(len(values), dtype=dtype)
+    data[valid] = present
+    return data, valid
+
+
+def _write_cell_scalar_table(cells_grp: h5py.Group, schema: CellSchema, cells: List[Cell]):
+    """
+    Write all scalar attributes as one compound dataset '/cells/scalars'.
+
+    Each field holds one attribute across cells in its own dtype. Attributes
+    that are None on some cells get a companion '<attr>__valid' bool field.
+    """
+    columns = {}
+    for attr in schema.scalar_attrs:
+        data, valid = _scalar_column(attr, [getattr(c, attr, None) for c in cells])
+        if data is None:
+            continue
+        columns[attr] = data
+        if valid is not None:
+            columns[f'{attr}__valid'] = valid
+
+    if not columns:
+        return
+
+    table = np.empty(len(cells), dtype=[(attr, data.dtype) for attr, data in columns.items()])
+    for attr, data in columns.items():
+        table[attr] = data
+
+    cells_grp.create_dataset('scalars', data=table)
+
+
+def _write_cell_strings(cells_grp: h5py.Group, attr: str, values: List):
+    """Write one string attribute for all cells as a 1-D string dataset ('' = None)."""
+    if all(v is None for v in values):
+        return
+
+    data = np.array(['' if v is None else v for v in values], dtype=h5py.string_dtype())
+    cells_grp.create_dataset(attr, data=data)
+
+
+# ============================================================================
+# Save / load
+# ============================================================================
 
 def save_extraction_hdf5(ce: CellExtraction, filename: str):
     """
     Save CellExtraction to HDF5 file.
 
     Structure:
-        /fov_metadata/ - FOV parameters
+        /fov_metadata/ - FOV parameters, plus string attributes shared by all cells
         /acquisition/ - Timing and stimulus data
-        /cells/cell_0/ - Individual cell data
-        /cells/cell_1/
-        ...
+        /cells/ - One dataset per cell attribute, shape [n_cells, ...]
+            raw, dff, cyc, ...
+            scalars - Compound dataset of scalar attributes (xPos, yPos, ...),
+                with '<attr>__valid' fields for attributes missing on some cells
 
     Args:
         ce: CellExtraction object
@@ -29,97 +384,338 @@ def save_extraction_hdf5(ce: CellExtraction, filename: str):
     filepath = Path(filename)
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    with h5py.File(filepath, 'w') as f:
+    with h5py.File(filepath, 'w', **H5_CACHE_KWARGS) as f:
         # Save FOV metadata
         if ce.fov is not None:
             fov_grp = f.create_group('fov_metadata')
-            from fov_config_suite2p import export_fov_to_dict
-            fov_dict = export_fov_to_dict(ce.fov)
-            for key, val in fov_dict.items():
-                if val is not None:
-                    try:
-                        fov_grp.attrs[key] = val
-                    except:
-                        fov_grp.attrs[key] = str(val)
-
-        # Save acquisition data
+            fov_grp.attrs.update(_fov_attrs(ce.fov))
+
+        # Save acquisition data (small, so checksummed to detect corruption)
         acq_grp = f.create_group('acquisition')
-        if ce.twophotontimes is not None:
-            acq_grp.create_dataset('twophotontimes', data=ce.twophotontimes)
-        if ce.stimOn is not None:
-            acq_grp.create_dataset('stimOn', data=ce.stimOn)
-        if ce.stimID is not None:
-            acq_grp.create_dataset('stimID', data=ce.stimID)
-        if ce.uniqStims is not None:
-            acq_grp.create_dataset('uniqStims', data=ce.uniqStims)
-        if ce.regOffsets is not None:
-            acq_grp.create_dataset('regOffsets', data=ce.regOffsets)
-
-        # Save cells
+        for key in ACQUISITION_KEYS:
+            val = getattr(ce, key)
+            if val is not None:
+                # Fletcher32 needs a chunked layout, which scalars cannot have
+                acq_grp.create_dataset(key, data=val, fletcher32=np.ndim(val) > 0)
+
+        # Save cells (one dataset per attribute across all cells)
         cells_grp = f.create_group('cells')
-        for i, cell in enumerate(ce.cells):
-            cell_grp = cells_grp.create_group(f'cell_{i}')
-
-            # Save all cell attributes
-            for attr in dir(cell):
-                if not attr.startswith('_'):
-                    val = getattr(cell, attr)
-                    if val is not None and not callable(val):
-                        if isinstance(val, np.ndarray):
-                            cell_grp.create_dataset(attr, data=val)
-                        elif isinstance(val, (int, float, bool)):
-                            cell_grp.attrs[attr] = val
-                        elif isinstance(val, str):
-                            cell_grp.attrs[attr] = val
+        cells_grp.attrs['n_cells'] = len(ce.cells)
+        schema = _cell_schema(ce.cells)
+        _write_schema(cells_grp, schema)
+
+        for attr in schema.array_attrs:
+            _write_cell_arrays(cells_grp, attr, [getattr(c, attr, None) for c in ce.cells])
+        _write_cell_scalar_table(cells_grp, schema, ce.cells)
+        for attr in _write_shared_strings(f, cells_grp, schema, ce.cells):
+            _write_cell_strings(cells_grp, attr, [getattr(c, attr, None) for c in ce.cells])
 
     print(f"✓ Saved to {filepath}")
 
 
-def load_extraction_hdf5(filename: str) -> CellExtraction:
+def repack_hdf5(filename: str):
+    """
+    Rewrite an HDF5 file to remove free space left by deleted or resized objects.
+
+    HDF5 does not reclaim space when datasets are deleted or rewritten, so
+    files modified in place grow and fragment. All objects are copied (with
+    their chunking and compression) into a fresh file, which then replaces
+    the original. Files just written by save_extraction_hdf5 are already
+    compact; this is only useful after editing a file in place.
+
+    Args:
+        filename: HDF5 filename to repack in place
+    """
+    filepath = Path(filename)
+    tmp_path = filepath.with_name(filepath.name + '.repack')
+
+    try:
+        with h5py.File(filepath, 'r') as src, h5py.File(tmp_path, 'w') as dst:
+            for key, val in src.attrs.items():
+                dst.attrs[key] = val
+            for name in src:
+                src.copy(src[name], dst, name=name)
+        os.replace(tmp_path, filepath)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _load_cells_legacy(cells_grp: h5py.Group) -> List[Cell]:
+    """Load cells from the older per-cell group layout (/cells/cell_0/...)."""
+    cells = []
+
+    # Groups were written as cell_0 .. cell_{N-1}, so index them directly
+    for i in range(len(cells_grp)):
+        cell_grp = cells_grp[f'cell_{i}']
+        cell = Cell()
+
+        # Load datasets
+        for key in cell_grp.keys():
+            setattr(cell, key, cell_grp[key][:])
+
+        # Load attributes
+        for key, val in cell_grp.attrs.items():
+            setattr(cell, key, val)
+
+        cells.append(cell)
+
+    return cells
+
+
+def _read_extraction_hdf5(f: h5py.File, ce: CellExtraction, lazy: bool):
+    """Fill a CellExtraction from an open HDF5 file (see load_extraction_hdf5)"""
+    # Load acquisition data
+    if 'acquisition' in f:
+        acq_grp = f['acquisition']
+        for key in ACQUISITION_KEYS:
+            if key in acq_grp:
+                setattr(ce, key, acq_grp[key][()])
+
+    # Load cells
+    if 'cells' not in f:
+        return
+    cells_grp = f['cells']
+
+    if 'n_cells' not in cells_grp.attrs:
+        ce.cells = _load_cells_legacy(cells_grp)
+        return
+
+    schema = _stored_schema(cells_grp)
+
+    # Large trace arrays stay on disk in lazy mode
+    lazy_attrs = set()
+    if lazy:
+        for attr in schema.array_attrs:
+            if (attr in COMPRESSED_ATTRS and attr in cells_grp
+                    and not cells_grp[attr].attrs.get('ragged', False)):
+                lazy_attrs.add(attr)
+                ce.h5_datasets[attr] = cells_grp[attr]
+
+    # All scalar attributes come from one compound dataset
+    scalars = cells_grp['scalars'][:] if 'scalars' in cells_grp else None
+    fields = scalars.dtype.names if scalars is not None else ()
+    scalar_attrs = [attr for attr in schema.scalar_attrs if attr in fields]
+    valid = {attr: scalars[f'{attr}__valid'] for attr in scalar_attrs
+             if f'{attr}__valid' in fields}
+
+    # One contiguous read per attribute; cells get views into these slabs
+    arrays = {}
+    for attr in schema.array_attrs:
+        if attr in cells_grp and attr not in lazy_attrs:
+            data = cells_grp[attr][:]
+            if cells_grp[attr].attrs.get('ragged', False):
+                arrays[attr] = _split_ragged(data, cells_grp[f'{attr}_shapes'][:])
+            else:
+                arrays[attr] = data
+    strings = {attr: cells_grp[attr].asstr()[:]
+               for attr in schema.str_attrs if attr in cells_grp}
+
+    for i in range(int(cells_grp.attrs['n_cells'])):
+        cell = Cell()
+
+        for attr in lazy_attrs:
+            cell.defer_attr(attr, ce.h5_datasets[attr], i)
+        for attr, data in arrays.items():
+            setattr(cell, attr, data[i])
+        for attr in scalar_attrs:
+            is_valid = attr not in valid or valid[attr][i]
+            setattr(cell, attr, scalars[attr][i] if is_valid else None)
+        for attr, data in strings.items():
+            setattr(cell, attr, data[i] or None)
+
+        ce.cells.append(cell)
+
+    _read_shared_strings(f, cells_grp, ce.cells)
+
+
+def load_extraction_hdf5(filename: str, lazy: bool = False) -> CellExtraction:
     """
     Load CellExtraction from HDF5 file.
 
     Args:
         filename: HDF5 filename
+        lazy: If True, leave large trace arrays (raw, dff, cyc, ...) on disk.
+            Each cell reads its own slice on first attribute access, and the
+            full datasets are available as h5py Datasets in ce.h5_datasets
+            for sliced reads (e.g. ce.h5_datasets['raw'][:, :1000]). The file
+            stays open until ce.close() is called; values not read by then
+            can no longer be loaded.
 
     Returns:
         CellExtraction object
     """
     ce = CellExtraction()
 
-    with h5py.File(filename, 'r') as f:
-        # Load acquisition data
-        if 'acquisition' in f:
-            acq_grp = f['acquisition']
-            if 'twophotontimes' in acq_grp:
-                ce.twophotontimes = acq_grp['twophotontimes'][:]
-            if 'stimOn' in acq_grp:
-                ce.stimOn = acq_grp['stimOn'][:]
-            if 'stimID' in acq_grp:
-                ce.stimID = acq_grp['stimID'][:]
-            if 'uniqStims' in acq_grp:
-                ce.uniqStims = acq_grp['uniqStims'][:]
-            if 'regOffsets' in acq_grp:
-                ce.regOffsets = acq_grp['regOffsets'][:]
-
-        # Load cells
-        if 'cells' in f:
-            cells_grp = f['cells']
-            cell_names = sorted(cells_grp.keys(), key=lambda x: int(x.split('_')[1]))
-
-            for cell_name in cell_names:
-                cell_grp = cells_grp[cell_name]
-                cell = Cell()
-
-                # Load datasets
-                for key in cell_grp.keys():
-                    setattr(cell, key, cell_grp[key][:])
-
-                # Load attributes
-                for key, val in cell_grp.attrs.items():
-                    setattr(cell, key, val)
-
-                ce.cells.append(cell)
+    f = h5py.File(filename, 'r', **H5_CACHE_KWARGS)
+    try:
+        _read_extraction_hdf5(f, ce, lazy)
+    except Exception:
+        f.close()
+        raise
+
+    if lazy:
+        ce._h5file = f
+    else:
+        f.close()
 
     print(f"✓ Loaded {len(ce.cells)} cells from {filename}")
     return ce
+
+
+# ============================================================================
+# Zarr backend
+# ============================================================================
+
+def save_extraction_zarr(ce: CellExtraction, path: str):
+    """
+    Save CellExtraction to a Zarr directory store.
+
+    Uses the same groups as save_extraction_hdf5 (fov_metadata, acquisition,
+    cells), but each scalar attribute is its own 1-D array (with an
+    '<attr>__valid' mask if some cells are None) and per-cell strings are fixed-width unicode arrays, instead of the compound
+    'scalars' dataset and variable-length strings. Trace arrays are chunked
+    by cell like the HDF5 datasets and compressed with Blosc (zstd +
+    bitshuffle); when dask is installed, chunks are compressed and written
+    in parallel threads.
+
+    Requires: pip install "zarr<3" numcodecs (optional: dask)
+
+    Args:
+        ce: CellExtraction object
+        path: Output .zarr directory
+    """
+    import zarr
+    from numcodecs import Blosc
+
+    compressor = Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE)
+
+    root = zarr.open_group(str(path), mode='w')
+
+    # Save FOV metadata
+    if ce.fov is not None:
+        fov_grp = root.create_group('fov_metadata')
+        fov_grp.attrs.update(_fov_attrs(ce.fov))
+
+    # Save acquisition data
+    acq_grp = root.create_group('acquisition')
+    for key in ACQUISITION_KEYS:
+        val = getattr(ce, key)
+        if val is not None:
+            acq_grp.create_dataset(key, data=np.asarray(val))
+
+    # Save cells
+    cells_grp = root.create_group('cells')
+    cells_grp.attrs['n_cells'] = len(ce.cells)
+    schema = _cell_schema(ce.cells)
+    _write_schema(cells_grp, schema)
+
+    for attr in schema.array_attrs:
+        values = [getattr(c, attr, None) for c in ce.cells]
+        present = [v for v in values if v is not None]
+        if not present:
+            continue
+
+        shape = np.shape(present[0])
+        if len(present) < len(values) or any(np.shape(v) != shape for v in present):
+            flat, shapes = _ragged_cell_arrays(values)
+            z = cells_grp.create_dataset(attr, data=flat, compressor=compressor)
+            z.attrs['ragged'] = True
+            cells_grp.create_dataset(f'{attr}_shapes', data=shapes)
+            continue
+
+        data = np.stack(values)
+        if attr in COMPRESSED_ATTRS and data.size:
+            _write_zarr_parallel(cells_grp, attr, data, compressor)
+        else:
+            cells_grp.create_dataset(attr, data=data, compressor=compressor)
+
+    for attr in schema.scalar_attrs:
+        data, valid = _scalar_column(attr, [getattr(c, attr, None) for c in ce.cells])
+        if data is not None:
+            cells_grp.create_dataset(attr, data=data)
+        if valid is not None:
+            cells_grp.create_dataset(f'{attr}__valid', data=valid)
+
+    for attr in _write_shared_strings(root, cells_grp, schema, ce.cells):
+        values = [getattr(c, attr, None) for c in ce.cells]
+        if any(v is not None for v in values):
+            cells_grp.create_dataset(attr, data=np.array(['' if v is None else v for v in values]))
+
+    print(f"✓ Saved to {path}")
+
+
+def _write_zarr_parallel(grp, attr: str, data: np.ndarray, compressor):
+    """Write a stacked [n_cells, ...] array in cell chunks, via dask if available"""
+    chunks = (_chunk_rows(data),) + data.shape[1:]
+    z = grp.create_dataset(attr, shape=data.shape, dtype=data.dtype,
+                           chunks=chunks, compressor=compressor)
+    try:
+        import dask.array as da
+    except ImportError:
+        z[:] = data
+        return
+
+    # Dask chunks align with Zarr chunks, so no locking is needed
+    da.from_array(data, chunks=chunks).store(z, lock=False)
+
+
+def load_extraction_zarr(path: str) -> CellExtraction:
+    """
+    Load CellExtraction from a Zarr directory store.
+
+    Args:
+        path: .zarr directory written by save_extraction_zarr
+
+    Returns:
+        CellExtraction object
+    """
+    import zarr
+
+    ce = CellExtraction()
+    root = zarr.open_group(str(path), mode='r')
+
+    # Load acquisition data
+    if 'acquisition' in root:
+        acq_grp = root['acquisition']
+        for key in ACQUISITION_KEYS:
+            if key in acq_grp:
+                setattr(ce, key, acq_grp[key][()])
+
+    # Load cells (one read per attribute, then split across cells)
+    if 'cells' in root:
+        cells_grp = root['cells']
+        n_cells = int(cells_grp.attrs['n_cells'])
+        ce.cells = [Cell() for _ in range(n_cells)]
+        schema = _stored_schema(cells_grp)
+
+        for attr in schema.array_attrs:
+            if attr not in cells_grp:
+                continue
+            data = cells_grp[attr][:]
+            if cells_grp[attr].attrs.get('ragged', False):
+                values = _split_ragged(data, cells_grp[f'{attr}_shapes'][:])
+            else:
+                values = list(data)
+            for cell, val in zip(ce.cells, values):
+                setattr(cell, attr, val)
+
+        for attr in schema.scalar_attrs:
+            if attr not in cells_grp:
+                continue
+            data = cells_grp[attr][:]
+            if f'{attr}__valid' in cells_grp:
+                valid = cells_grp[f'{attr}__valid'][:]
+            else:
+                valid = np.ones(n_cells, dtype=bool)
+            for cell, val, is_valid in zip(ce.cells, data, valid):
+                setattr(cell, attr, val if is_valid else None)
+
+        for attr in schema.str_attrs:
+            if attr in cells_grp:
+                for cell, val in zip(ce.cells, cells_grp[attr][:]):
+                    setattr(cell, attr, str(val) or None)
+        _read_shared_strings(root, cells_grp, ce.cells)
+
+    print(f"✓ Loaded {len(ce.cells)} cells from {path}")
+    return ce
@@ -7,9 +7,24 @@ orientation/direction selectivity indices.
 
 import numpy as np
 from scipy.optimize import least_squares
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+import os
 import warnings
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 
 # ============================================================================
 # Circular Statistics Helper Functions
@@ -44,6 +59,86 @@ def wrapTo180(angles_deg: np.ndarray) -> np.ndarray:
     return np.mod(angles_deg, 180)
 
 
+# ============================================================================
+# Compiled Kernels (numba, if installed)
+# ============================================================================
+
+@njit(cache=True, nogil=True)
+def _angular_distance(D: np.ndarray) -> np.ndarray:
+    """Elementwise min(|d|, |d + 360|, |d - 360|)"""
+    out = np.empty(D.shape[0])
+    for i in range(D.shape[0]):
+        out[i] = min(abs(D[i]), abs(D[i] + 360), abs(D[i] - 360))
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _double_gauss_kernel(R_offset: float, R_pref: float, theta_pref: float,
+                         sigma: float, R_opp: float, X: np.ndarray) -> np.ndarray:
+    """Double Gaussian evaluated at float64 directions X (see double_gauss)"""
+    D = _angular_distance(X - theta_pref)
+    D2 = _angular_distance(X + 180 - theta_pref)
+    two_sigma2 = 2 * sigma ** 2
+    return (R_offset +
+            R_pref * np.exp(-(D ** 2) / two_sigma2) +
+            R_opp * np.exp(-(D2 ** 2) / two_sigma2))
+
+
+@njit(cache=True, nogil=True)
+def _double_gauss_residuals(params: np.ndarray, X: np.ndarray, Resp: np.ndarray) -> np.ndarray:
+    """Residuals Resp - double_gauss(params, X) for least-squares fitting"""
+    return Resp - _double_gauss_kernel(params[0], params[1], params[2],
+                                       params[3], params[4], X)
+
+
+@njit(cache=True, nogil=True)
+def _brute_force_peak(R_offset: float, R_pref: float, sigma: float,
+                      X: np.ndarray, Resp: np.ndarray) -> int:
+    """Preferred direction (5-degree grid) minimizing single-Gaussian squared error"""
+    minError = np.inf
+    bestPeak = 0
+    for peak in range(0, 360, 5):
+        D = _angular_distance(X - peak)
+        pred = R_offset + R_pref * np.exp(-(D ** 2) / (2 * sigma ** 2))
+        error = np.sum((pred - Resp) ** 2)
+        if error < minError:
+            minError = error
+            bestPeak = peak
+    return bestPeak
+
+
+@njit(cache=True, nogil=True)
+def _vector_tuning(meanResponse: np.ndarray, exp_ort: np.ndarray,
+                   exp_dir: np.ndarray, n_orts: int) -> Tuple[complex, complex]:
+    """
+    Orientation and direction bias vectors (vector-averaging method).
+
+    exp_ort/exp_dir are the precomputed exp(1j*2*oriRad) and exp(1j*oriRad).
+    """
+    sum_ort = 0j
+    norm_ort = 0.0
+    for k in range(n_orts):
+        # nanmean of the two directions sharing this orientation
+        a = meanResponse[k]
+        b = meanResponse[k + n_orts]
+        if np.isnan(a):
+            rk = b
+        elif np.isnan(b):
+            rk = a
+        else:
+            rk = (a + b) / 2
+        sum_ort += rk * exp_ort[k]
+        norm_ort += rk
+
+    sum_dir = 0j
+    norm_dir = 0.0
+    for k in range(2 * n_orts):
+        sum_dir += meanResponse[k] * exp_dir[k]
+        norm_dir += meanResponse[k]
+
+    return sum_ort / norm_ort, sum_dir / norm_dir
+
+
 # ============================================================================
 # Gaussian Fitting Functions
 # ============================================================================
@@ -67,21 +162,10 @@ def double_gauss(params: np.ndarray, X: np.ndarray) -> np.ndarray:
     Returns:
         Fitted response values
     """
-    R_offset, R_pref, theta_pref, sigma, R_opp = params
-
-    # Calculate angular differences (with wrapping)
-    D = X - theta_pref
-    D = np.array([min(abs(d), abs(d + 360), abs(d - 360)) for d in D])
+    R_offset, R_pref, theta_pref, sigma, R_opp = (float(p) for p in params)
+    X = np.ascontiguousarray(X, dtype=np.float64)
 
-    D2 = X + 180 - theta_pref
-    D2 = np.array([min(abs(d), abs(d + 360), abs(d - 360)) for d in D2])
-
-    # Double Gaussian
-    Y = (R_offset +
-         R_pref * np.exp(-(D ** 2) / (2 * sigma ** 2)) +
-         R_opp * np.exp(-(D2 ** 2) / (2 * sigma ** 2)))
-
-    return Y
+    return _double_gauss_kernel(R_offset, R_pref, theta_pref, sigma, R_opp, X)
 
 
 def circular_gauss(params: np.ndarray, theta: float) -> float:
@@ -122,7 +206,8 @@ def fit_tuning_direction(meanResponse: np.ndarray,
     """
     minVal = np.min(meanResponse)
     maxVal = np.max(meanResponse)
-    Resp = meanResponse[:len(X)]
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    Resp = np.ascontiguousarray(meanResponse[:len(X)], dtype=np.float64)
 
     # Handle edge cases for bounds calculation
     if minVal <= 0:
@@ -141,20 +226,7 @@ def fit_tuning_direction(meanResponse: np.ndarray,
     G0[3] = 20  # sigma (initial guess)
 
     # Find initial estimate for preferred direction using brute force
-    minError = np.inf
-    bestPeak = 0
-
-    for i in range(0, 360, 5):
-        G0[2] = i
-        error = 0
-        for j, x_val in enumerate(X):
-            pred = circular_gauss(G0, x_val)
-            error += (pred - Resp[j]) ** 2
-
-        if error < minError:
-            minError = error
-            bestPeak = i
-
+    bestPeak = _brute_force_peak(G0[0], G0[1], G0[3], X, Resp)
     G0[2] = bestPeak
 
     # Alternative: use peak of data
@@ -181,10 +253,7 @@ def fit_tuning_direction(meanResponse: np.ndarray,
     G0 = np.clip(G0, LB, UB)
 
     # Fit using least squares - use Resp (truncated to match X), not full meanResponse
-    def residuals(params):
-        return Resp - double_gauss(params, X)
-
-    result = least_squares(residuals, G0, bounds=(LB, UB))
+    result = least_squares(_double_gauss_residuals, G0, bounds=(LB, UB), args=(X, Resp))
     G = result.x
 
     # Generate fit data at the stimulus positions
@@ -203,8 +272,28 @@ def fit_tuning_direction(meanResponse: np.ndarray,
     return G, r_matrix, p_matrix
 
 
+# Fewer directions than this can't constrain the 5-parameter double Gaussian
+MIN_TUNING_DIRS = 4
+
+
+def stim_exponentials(stimInfo: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute the complex exponentials used by the vector tuning method.
+
+    Args:
+        stimInfo: Vector of directions (degrees, not including blank)
+
+    Returns:
+        Tuple of (exp_ort, exp_dir): exp(1j*2*oriRad) and exp(1j*oriRad)
+    """
+    oriRad = circ_axial(circ_ang2rad(np.asarray(stimInfo, dtype=np.float64)), 1)
+    return np.exp(1j * 2 * oriRad), np.exp(1j * oriRad)
+
+
 def get_tuning_madineh(meanResponse: np.ndarray,
-                        stimInfo: np.ndarray) -> Tuple[Dict, np.ndarray, np.ndarray]:
+                        stimInfo: np.ndarray,
+                        stim_exp: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                        ) -> Tuple[Dict, np.ndarray, np.ndarray]:
     """
     Calculate direction and orientation tuning metrics.
 
@@ -213,6 +302,8 @@ def get_tuning_madineh(meanResponse: np.ndarray,
     Args:
         meanResponse: Trial-averaged response at each stimulus condition
         stimInfo: Vector of directions (degrees, not including blank)
+        stim_exp: Optional result of stim_exponentials(stimInfo), to reuse
+            across cells that share the same stimInfo
 
     Returns:
         Tuple of (DIR2, meanResponse_fit, FITDATA)
@@ -226,22 +317,17 @@ def get_tuning_madineh(meanResponse: np.ndarray,
     div = 360 / n_dirs
     n_orts = n_dirs // 2
 
-    # Convert to radians for circular stats
-    oriRad = circ_axial(circ_ang2rad(stimInfo), 1)
+    # Circular-stat exponentials (angle doubling for orientation)
+    if stim_exp is None:
+        stim_exp = stim_exponentials(stimInfo)
+    exp_ort, exp_dir = stim_exp
 
     # ========================================================================
-    # Calculate orientation tuning using vector method
+    # Calculate orientation and direction tuning using vector method
     # ========================================================================
-    rk2_ort = np.zeros(n_orts)
-    exponent_ort = np.zeros(n_orts, dtype=complex)
-
-    for k in range(n_orts):
-        # Average response at this orientation (both directions)
-        rk2_ort[k] = np.nanmean([meanResponse[k], meanResponse[k + n_orts]])
-        # Angle doubling for orientation
-        exponent_ort[k] = rk2_ort[k] * np.exp(1j * 2 * oriRad[k])
-
-    biasvector_ort = np.sum(exponent_ort) / np.sum(rk2_ort)
+    biasvector_ort, biasvector_dir = _vector_tuning(
+        np.ascontiguousarray(meanResponse, dtype=np.float64), exp_ort, exp_dir, n_orts
+    )
     DIR2['oti_vec'] = np.abs(biasvector_ort)
 
     # Preferred orientation from vector method
@@ -250,17 +336,6 @@ def get_tuning_madineh(meanResponse: np.ndarray,
     if DIR2['pref_ort_vec'] > 180:
         DIR2['pref_ort_vec'] = DIR2['pref_ort_vec'] - 180
 
-    # ========================================================================
-    # Calculate direction tuning using vector method
-    # ========================================================================
-    rk2_dir = np.zeros(2 * n_orts)
-    exponent_dir = np.zeros(2 * n_orts, dtype=complex)
-
-    for k in range(2 * n_orts):
-        rk2_dir[k] = np.nanmean([meanResponse[k]])
-        exponent_dir[k] = rk2_dir[k] * np.exp(1j * oriRad[k])
-
-    biasvector_dir = np.sum(exponent_dir) / np.sum(rk2_dir)
     DIR2['dti_vec'] = np.abs(biasvector_dir)
 
     # ========================================================================
@@ -323,3 +398,60 @@ def get_tuning_madineh(meanResponse: np.ndarray,
     DIR2['oti_fit'] = max(0, min(1, DIR2['oti_fit']))
 
     return DIR2, meanResponse_fit, FITDATA
+
+
+def _fit_tuning(meanResponse: np.ndarray, stimInfo: np.ndarray,
+                stim_exp: Tuple[np.ndarray, np.ndarray]):
+    """Fit one cell for get_tuning_population, returning the exception on failure"""
+    try:
+        return get_tuning_madineh(meanResponse, stimInfo, stim_exp)
+    except Exception as e:
+        return e
+
+
+def get_tuning_population(responses: List[np.ndarray],
+                          stimInfo: np.ndarray,
+                          n_jobs: Optional[int] = None,
+                          prefer: str = 'processes') -> List[Union[Tuple[Dict, np.ndarray, np.ndarray], Exception, None]]:
+    """
+    Run get_tuning_madineh for many cells in parallel.
+
+    Cells are independent, but most of each fit is spent in scipy's
+    pure-Python least-squares driver (bounds handling and finite-difference
+    Jacobians), which holds the GIL. Worker processes are therefore the
+    default; threads avoid process start-up and pickling, but only overlap
+    the small share of time spent in numba kernels and LAPACK.
+
+    With prefer='processes', scripts must guard their entry point with
+    `if __name__ == '__main__':` on platforms that spawn workers (Windows, macOS).
+
+    Args:
+        responses: Per-cell mean responses, each aligned with stimInfo
+        stimInfo: Vector of directions (degrees, not including blank)
+        n_jobs: Number of workers (default: number of CPUs)
+        prefer: 'processes' or 'threads'
+
+    Returns:
+        List with one (DIR2, meanResponse_fit, FITDATA) tuple per cell,
+        or the raised exception for cells where the fit failed. All entries
+        are None if stimInfo has fewer than MIN_TUNING_DIRS directions.
+    """
+    if prefer not in ('processes', 'threads'):
+        raise ValueError(f"prefer must be 'processes' or 'threads', not {prefer!r}")
+    if len(stimInfo) < MIN_TUNING_DIRS:
+        return [None] * len(responses)
+
+    stim_exp = stim_exponentials(stimInfo)
+
+    if n_jobs is not None and n_jobs < 1:
+        n_jobs = None
+
+    # Batch several cells per task so inter-process overhead is amortized
+    # (ignored by the thread pool)
+    n_workers = n_jobs or os.cpu_count() or 1
+    chunksize = max(1, len(responses) // (4 * n_workers))
+
+    executor = ProcessPoolExecutor if prefer == 'processes' else ThreadPoolExecutor
+    with executor(max_workers=n_jobs) as pool:
+        return list(pool.map(_fit_tuning, responses, repeat(stimInfo), repeat(stim_exp),
+                             chunksize=chunksize))
@@ -0,0 +1,257 @@
+"""
+Round-trip tests for HDF5 and Zarr save/load of cell extractions.
+"""
+
+import sys
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ophys_analysis import Cell, CellExtraction, save_extraction_hdf5, load_extraction_hdf5
+
+
+def test_extra_attrs_missing_on_first_cell(tmp_path):
+    """Extra attributes that are None on cell 0 are still saved for later cells"""
+    ce = CellExtraction()
+    for i in range(3):
+        cell = Cell()
+        cell.raw = np.arange(10, dtype=float) + i
+        cell.xPos = float(i)
+        if i > 0:
+            cell.pref = np.array([i, 2 * i], dtype=float)
+            cell.tag = f'cell{i}'
+            cell.osi = 0.1 * i
+        else:
+            cell.pref = cell.tag = cell.osi = None
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+    loaded = load_extraction_hdf5(str(filename))
+
+    assert loaded.cells[0].pref is None
+    assert loaded.cells[0].tag is None
+    assert loaded.cells[0].osi is None
+    for i in (1, 2):
+        cell = loaded.cells[i]
+        np.testing.assert_array_equal(cell.pref, [i, 2 * i])
+        assert cell.tag == f'cell{i}'
+        assert np.isclose(cell.osi, 0.1 * i)
+        np.testing.assert_array_equal(cell.raw, np.arange(10, dtype=float) + i)
+
+
+def test_extra_scalar_mixed_int_float(tmp_path):
+    """An extra scalar that is an int on cell 0 and a float later stays float"""
+    ce = CellExtraction()
+    for snr in (3, 2.5, 2.25):
+        cell = Cell()
+        cell.snr = snr
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+    loaded = load_extraction_hdf5(str(filename))
+
+    assert [cell.snr for cell in loaded.cells] == [3.0, 2.5, 2.25]
+
+
+def test_responsive_cells_follow_in_place_edits(tmp_path):
+    """Loaded extractions reflect later edits to cell scalars"""
+    ce = CellExtraction()
+    for i in range(3):
+        cell = Cell()
+        cell.xPos = float(i)
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+    loaded = load_extraction_hdf5(str(filename))
+
+    loaded.cells[0].ROI_responsiveness = True
+    loaded.cells[1].xPos = 10.0
+    assert len(loaded.get_responsive_cells()) == 1
+    np.testing.assert_array_equal(loaded.to_array('xPos'), [0.0, 10.0, 2.0])
+
+    loaded.cells[2].ROI_responsiveness = None
+    assert loaded.to_array('ROI_responsiveness')[2] is None
+
+
+def test_scalar_acquisition_value(tmp_path):
+    """0-d acquisition values are saved without a checksum and read back"""
+    ce = CellExtraction()
+    ce.twophotontimes = np.linspace(0, 1, 5)
+    ce.stimOn = np.float64(2.5)
+    cell = Cell()
+    cell.raw = np.zeros(5)
+    ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, filename)
+    loaded = load_extraction_hdf5(filename)
+
+    assert loaded.stimOn == 2.5
+    np.testing.assert_array_equal(loaded.twophotontimes, ce.twophotontimes)
+
+
+def test_partially_missing_mask_is_compressed(tmp_path):
+    """A trace attribute missing on some cells is still chunked and compressed"""
+    ce = CellExtraction()
+    for i in range(3):
+        cell = Cell()
+        cell.mask_2d = None if i == 1 else np.full((64, 64), float(i))
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+    with h5py.File(filename, 'r') as f:
+        dset = f['cells']['mask_2d']
+        assert dset.attrs['ragged']
+        assert dset.chunks is not None
+        assert dset.id.get_create_plist().get_nfilters() > 0
+
+    loaded = load_extraction_hdf5(str(filename))
+    assert loaded.cells[1].mask_2d is None
+    for i in (0, 2):
+        np.testing.assert_array_equal(loaded.cells[i].mask_2d, np.full((64, 64), float(i)))
+
+
+def test_zarr_round_trip(tmp_path):
+    """Zarr store round-trips traces, ragged masks, scalars, strings and acquisition data"""
+    pytest.importorskip('zarr')
+    from ophys_analysis import save_extraction_zarr, load_extraction_zarr
+
+    ce = CellExtraction()
+    ce.twophotontimes = np.linspace(0, 1, 50)
+    ce.stimOn = np.float64(2.5)
+    for i in range(5):
+        cell = Cell()
+        cell.raw = np.arange(50, dtype=np.float32) + i
+        cell.mask_2d = np.ones((300, 300)) * i
+        cell.mask = np.arange(i + 1)
+        cell.xPos = float(i)
+        cell.file = f'plane{i}'
+        ce.cells.append(cell)
+
+    path = tmp_path / 'extraction.zarr'
+    save_extraction_zarr(ce, str(path))
+    loaded = load_extraction_zarr(str(path))
+
+    import zarr
+    # Chunks hold whole cells but stay near CHUNK_TARGET_BYTES
+    assert zarr.open_group(str(path), mode='r')['cells']['mask_2d'].chunks[0] == 1
+
+    assert loaded.stimOn == 2.5
+    np.testing.assert_array_equal(loaded.twophotontimes, ce.twophotontimes)
+    for cell, orig in zip(loaded.cells, ce.cells):
+        np.testing.assert_array_equal(cell.raw, orig.raw)
+        np.testing.assert_array_equal(cell.mask_2d, orig.mask_2d)
+        np.testing.assert_array_equal(cell.mask, orig.mask)
+        assert cell.xPos == orig.xPos
+        assert cell.file == orig.file
+
+
+@pytest.mark.parametrize('backend', ['hdf5', 'zarr'])
+def test_missing_scalars_keep_dtype(tmp_path, backend):
+    """None in a scalar column round-trips without changing the column dtype or hiding NaN"""
+    if backend == 'zarr':
+        pytest.importorskip('zarr')
+        from ophys_analysis import save_extraction_zarr as save, load_extraction_zarr as load
+        filename = tmp_path / 'extraction.zarr'
+    else:
+        save, load = save_extraction_hdf5, load_extraction_hdf5
+        filename = tmp_path / 'extraction.h5'
+
+    ce = CellExtraction()
+    for responsive, x in ((True, 1.0), (None, np.nan), (False, None)):
+        cell = Cell()
+        cell.ROI_responsiveness = responsive
+        cell.xPos = x
+        ce.cells.append(cell)
+
+    save(ce, str(filename))
+    loaded = load(str(filename))
+
+    flags = [cell.ROI_responsiveness for cell in loaded.cells]
+    assert flags == [True, None, False]
+    assert all(isinstance(f, np.bool_) for f in flags if f is not None)
+    assert loaded.cells[0].xPos == 1.0
+    assert np.isnan(loaded.cells[1].xPos)
+    assert loaded.cells[2].xPos is None
+
+
+@pytest.mark.parametrize('path', ['direct', 'filter', 'lzf'])
+def test_compressed_trace_round_trip(tmp_path, monkeypatch, path):
+    """Compressed traces round-trip via direct bitshuffle chunks and the filter fallbacks"""
+    from ophys_analysis import io_utils
+
+    if path == 'direct' and not io_utils.HAS_BITSHUFFLE:
+        pytest.skip('bitshuffle not installed')
+    if path == 'filter' and not io_utils.HAS_HDF5PLUGIN:
+        pytest.skip('hdf5plugin not installed')
+    if path != 'direct':
+        monkeypatch.setattr(io_utils, 'HAS_BITSHUFFLE', False)
+    if path == 'lzf':
+        monkeypatch.setattr(io_utils, 'HAS_HDF5PLUGIN', False)
+
+    direct_attrs = []
+    write_direct_chunks = io_utils._write_direct_chunks
+
+    def record_direct(cells_grp, attr, data):
+        direct_attrs.append(attr)
+        write_direct_chunks(cells_grp, attr, data)
+
+    monkeypatch.setattr(io_utils, '_write_direct_chunks', record_direct)
+
+    # 70 cells do not fill a whole number of chunks for either attribute
+    rng = np.random.default_rng(0)
+    ce = CellExtraction()
+    for _ in range(70):
+        cell = Cell()
+        cell.raw = rng.standard_normal(5000).astype(np.float32)
+        cell.mask_2d = rng.random((40, 40)) > 0.5
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+    assert direct_attrs == (['raw', 'mask_2d'] if path == 'direct' else [])
+    with h5py.File(filename, 'r') as f:
+        for attr in ('raw', 'mask_2d'):
+            dset = f['cells'][attr]
+            assert dset.shape[0] % dset.chunks[0] != 0
+
+    loaded = load_extraction_hdf5(str(filename))
+    for cell, orig in zip(loaded.cells, ce.cells):
+        np.testing.assert_array_equal(cell.raw, orig.raw)
+        assert cell.mask_2d.dtype == np.bool_
+        np.testing.assert_array_equal(cell.mask_2d, orig.mask_2d)
+
+
+def test_lazy_load(tmp_path):
+    """Lazily loaded traces match an eager load and survive close() once read"""
+    ce = CellExtraction()
+    for i in range(5):
+        cell = Cell()
+        cell.raw = np.arange(100, dtype=float) + i
+        cell.dff = np.arange(100, dtype=float) * i
+        cell.xPos = float(i)
+        ce.cells.append(cell)
+
+    filename = tmp_path / 'extraction.h5'
+    save_extraction_hdf5(ce, str(filename))
+
+    with load_extraction_hdf5(str(filename), lazy=True) as loaded:
+        assert 'raw' not in vars(loaded.cells[0])
+        assert loaded.cells[2].xPos == 2.0
+        for cell, orig in zip(loaded.cells, ce.cells):
+            np.testing.assert_array_equal(cell.raw, orig.raw)
+        np.testing.assert_array_equal(loaded.cells[3].dff, ce.cells[3].dff)
+
+    # Values read before close() stay; unread ones can no longer be loaded
+    np.testing.assert_array_equal(loaded.cells[0].raw, ce.cells[0].raw)
+    with pytest.raises(RuntimeError):
+        loaded.cells[0].dff
+    loaded.close()  # Closing twice is harmless